@@ -1,14 +1,60 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import uuid
-import hashlib
+from tkinter import ttk
+import collections
+import itertools
 import random
+import secrets
+import sys
 import time
-from datetime import datetime
+
+# Générateur vectoriel NumPy, utilisé seulement au-delà de _NUMPY_MIN_BATCH eSIMs actives
+# (en dessous, le surcoût d'appel de NumPy dépasse le gain). Créé au premier besoin
+# pour ne pas payer l'import de NumPy au démarrage; False si NumPy est indisponible.
+_rng = None
+_NUMPY_MIN_BATCH = 16
+
+# États possibles d'un profil eSIM, internés pour être comparés par identité (is)
+_ACTIVE = sys.intern("Active")
+_INACTIVE = sys.intern("Inactive")
+_DISABLED = sys.intern("Disabled")
+
+
+def _vector_rng():
+    """Retourne le générateur NumPy (importé au premier appel), ou None si NumPy est absent"""
+    global _rng
+    if _rng is None:
+        try:
+            import numpy
+        except ImportError:  # NumPy est optionnel: tirages aléatoires en pur Python
+            _rng = False
+        else:
+            _rng = numpy.random.default_rng()
+    return _rng if _rng is not False else None
+
+
+def _random_digits(n):
+    """Génère une chaîne de n chiffres aléatoires en un seul tirage"""
+    return f"{random.randrange(10 ** n):0{n}d}"
+
 
 class eSIM:
     """Classe représentant une carte eSIM virtuelle"""
     
+    __slots__ = ("imsi", "iccid", "msisdn", "operator", "profile_state", "_list_label", "ki", "opc",
+                 "data_usage", "_data_limit", "_pct_factor", "events", "_event_count",
+                 "_pending_usage_mb", "_pending_since")
+    
+    # Nombre maximal d'événements conservés dans l'historique
+    max_events = 500
+    
+    # Seuils de regroupement des consommations en un seul événement (Mo, secondes)
+    usage_log_threshold_mb = 100
+    usage_log_interval_s = 300
+    
+    # Cache de l'horodatage des événements (résolution à la seconde)
+    _last_ts_sec = None
+    _last_ts_str = ""
+    
     def __init__(self, imsi=None, iccid=None, msisdn=None, operator=None):
         # Identifiants uniques de la carte SIM
         self.imsi = imsi or self._generate_imsi()  # International Mobile Subscriber Identity
@@ -17,7 +63,8 @@ class eSIM:
         
         # Informations sur l'opérateur
         self.operator = operator or "OpérateurDemo"
-        self.profile_state = "Inactive"  # État du profil: Inactive, Active, Disabled
+        self.profile_state = _INACTIVE  # État du profil: Inactive, Active, Disabled
+        self._refresh_list_label()
         
         # Génération de clés d'authentification (simulées)
         self.ki = self._generate_auth_key()  # Authentication Key
@@ -25,64 +72,100 @@ class eSIM:
         
         # Données de consommation
         self.data_usage = 0  # En Mo
-        self.data_limit = 10000  # 10 Go par défaut
+        self.data_limit = 10000  # 10 Go par défaut (fixe aussi _pct_factor)
+        
+        # Consommation pas encore journalisée
+        self._pending_usage_mb = 0.0
+        self._pending_since = time.time()
         
         # Historique des événements
-        self.events = []
+        self.events = collections.deque(maxlen=self.max_events)
+        self._event_count = 0  # Nombre total d'événements journalisés
         self.log_event("Création de l'eSIM")
     
+    @property
+    def data_limit(self):
+        """Limite de données en Mo"""
+        return self._data_limit
+    
+    @data_limit.setter
+    def data_limit(self, value):
+        self._data_limit = value
+        self._pct_factor = 100.0 / value  # Évite une division à chaque calcul de pourcentage
+    
     def _generate_imsi(self):
         """Génère un IMSI valide (15 chiffres)"""
         mcc = "208"  # Code pays (France)
         mnc = "01"   # Code réseau
-        msin = ''.join([str(random.randint(0, 9)) for _ in range(10)])
+        msin = _random_digits(10)
         return f"{mcc}{mnc}{msin}"
     
     def _generate_iccid(self):
         """Génère un ICCID valide (19-20 chiffres)"""
         iin = "8933"  # Issuer Identification Number
-        ccn = ''.join([str(random.randint(0, 9)) for _ in range(15)])
+        ccn = _random_digits(15)
         return f"{iin}{ccn}"
     
     def _generate_msisdn(self):
         """Génère un numéro de téléphone français"""
-        return f"336{''.join([str(random.randint(0, 9)) for _ in range(8)])}"
+        return f"336{_random_digits(8)}"
     
     def _generate_auth_key(self):
         """Génère une clé d'authentification hexadécimale"""
-        return hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:32]
+        return secrets.token_hex(16)
     
     def activate(self):
         """Active le profil eSIM"""
-        if self.profile_state != "Active":
-            self.profile_state = "Active"
+        if self.profile_state is not _ACTIVE:
+            self.profile_state = _ACTIVE
+            self._refresh_list_label()
             self.log_event("Activation du profil")
             return True
         return False
     
     def deactivate(self):
         """Désactive le profil eSIM"""
-        if self.profile_state != "Inactive":
-            self.profile_state = "Inactive"
+        if self.profile_state is not _INACTIVE:
+            self.profile_state = _INACTIVE
+            self._refresh_list_label()
+            self._flush_pending_usage()
             self.log_event("Désactivation du profil")
             return True
         return False
     
     def disable(self):
         """Désactive définitivement le profil eSIM"""
-        if self.profile_state != "Disabled":
-            self.profile_state = "Disabled"
+        if self.profile_state is not _DISABLED:
+            self.profile_state = _DISABLED
+            self._refresh_list_label()
+            self._flush_pending_usage()
             self.log_event("Désactivation définitive du profil")
             return True
         return False
     
     def add_data_usage(self, amount):
         """Ajoute de la consommation de données"""
+        now = time.time()
+        if not self._pending_usage_mb:
+            self._pending_since = now
         self.data_usage += amount
-        self.log_event(f"Consommation de {amount} Mo de données")
+        self._pending_usage_mb += amount
+        
+        # Un seul événement par tranche de consommation ou par intervalle de temps
+        if (self._pending_usage_mb >= self.usage_log_threshold_mb
+                or now - self._pending_since >= self.usage_log_interval_s):
+            self._flush_pending_usage()
+    
+    def _flush_pending_usage(self):
+        """Journalise la consommation cumulée depuis le dernier événement"""
+        if self._pending_usage_mb:
+            elapsed = time.time() - self._pending_since
+            self.log_event(f"Consommation cumulée de {self._pending_usage_mb:.2f} Mo sur {elapsed:.0f} s")
+            self._pending_usage_mb = 0.0
     
     def reset_data_usage(self):
         """Réinitialise les compteurs de consommation"""
+        self._flush_pending_usage()
         old_usage = self.data_usage
         self.data_usage = 0
         self.log_event(f"Réinitialisation du compteur de données (ancien: {old_usage} Mo)")
@@ -91,17 +174,44 @@ class eSIM:
         """Change l'opérateur de l'eSIM"""
         old_operator = self.operator
         self.operator = new_operator
+        self._refresh_list_label()
         self.log_event(f"Changement d'opérateur: {old_operator} -> {new_operator}")
     
+    def _refresh_list_label(self):
+        """Met à jour le libellé affiché dans la liste des eSIMs"""
+        self._list_label = f"{self.operator} ({self.profile_state})"
+    
     def log_event(self, description):
         """Ajoute un événement dans l'historique"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = int(time.time())
+        if now != eSIM._last_ts_sec:
+            eSIM._last_ts_sec = now
+            eSIM._last_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        timestamp = eSIM._last_ts_str
         self.events.append(f"[{timestamp}] {description}")
+        self._event_count += 1
 
 
 class eSIMManagerApp:
     """Application de gestion d'eSIM avec interface graphique Tkinter"""
     
+    # Intervalle entre deux ticks de simulation de consommation (ms)
+    SIMULATION_INTERVAL_MS = 30000
+    
+    # Disposition du panneau de détails: (titre de section, ((clé, libellé), ...))
+    _DETAIL_SECTIONS = (
+        ("INFORMATIONS GÉNÉRALES", (("operator", "Opérateur"),
+                                    ("state", "État du profil"))),
+        ("IDENTIFIANTS", (("imsi", "IMSI"),
+                          ("iccid", "ICCID"),
+                          ("msisdn", "MSISDN (téléphone)"))),
+        ("AUTHENTIFICATION", (("ki", "Clé Ki"),
+                              ("opc", "Code OPc"))),
+        ("CONSOMMATION", (("data_usage", "Données utilisées"),
+                          ("data_limit", "Limite de données"),
+                          ("pct", "Pourcentage utilisé"))),
+    )
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Gestionnaire eSIM")
@@ -128,9 +238,24 @@ class eSIMManagerApp:
         if self.esims:
             self.selected_esim = self.esims[0]
         
+        # Rafraîchissements de l'interface en attente (regroupés via after_idle)
+        self._details_dirty = False
+        self._history_dirty = False
+        self._flush_scheduled = False
+        
+        # Indique si un prochain tick de simulation est déjà planifié
+        self._sim_scheduled = False
+        
+        # eSIM affichée dans l'historique et nombre d'événements déjà rendus
+        self._history_esim = None
+        self._history_count = 0
+        
         # Création de l'interface
         self.create_widgets()
         
+        # Rafraîchissements en attente appliqués lorsque la fenêtre réapparaît
+        self.root.bind("<Map>", self._on_map)
+        
         # Simulation de trafic de données en arrière-plan
         self.simulate_data_usage()
     
@@ -157,6 +282,7 @@ class eSIMManagerApp:
         # Liste des eSIMs
         self.esim_listbox = tk.Listbox(self.list_frame, width=30, font=('Helvetica', 10))
         self.esim_listbox.pack(fill=tk.BOTH, expand=True)
+        self._listbox_labels = []  # Libellés actuellement affichés dans le listbox
         self.update_esim_list()
         
         # Liaison de l'événement de sélection
@@ -166,10 +292,22 @@ class eSIMManagerApp:
         self.details_frame = ttk.LabelFrame(self.main_frame, text="Détails de l'eSIM", padding="10")
         self.details_frame.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
         
-        # Zone de texte pour les détails
-        self.details_text = tk.Text(self.details_frame, width=50, height=15, wrap=tk.WORD, font=('Courier', 10))
-        self.details_text.pack(fill=tk.BOTH, expand=True)
-        self.details_text.config(state=tk.DISABLED)
+        # Grille de libellés pour les détails (seules les valeurs modifiées sont redessinées)
+        self._detail_vars = {}
+        self._detail_values = {}
+        row = 0
+        for title, fields in self._DETAIL_SECTIONS:
+            ttk.Label(self.details_frame, text=f"{title}:", style="Header.TLabel").grid(
+                row=row, column=0, columnspan=2, sticky="w", pady=(10 if row else 0, 2))
+            row += 1
+            for key, label in fields:
+                ttk.Label(self.details_frame, text=f"{label}:").grid(row=row, column=0, sticky="w")
+                var = tk.StringVar()
+                ttk.Label(self.details_frame, textvariable=var, font=('Courier', 10)).grid(
+                    row=row, column=1, sticky="w", padx=(10, 0))
+                self._detail_vars[key] = var
+                row += 1
+        self.details_frame.columnconfigure(1, weight=1)
         
         # Cadre pour les actions
         self.actions_frame = ttk.LabelFrame(self.main_frame, text="Actions", padding="10")
@@ -215,11 +353,32 @@ class eSIMManagerApp:
             self.update_esim_details()
             self.update_history()
     
-    def update_esim_list(self):
+    def update_esim_list(self, changed_index=None):
         """Met à jour la liste des eSIMs dans le listbox"""
+        labels = self._listbox_labels
+        
+        # Seule la ligne modifiée est réécrite (ou ajoutée en fin de liste)
+        if changed_index is not None and changed_index <= len(labels):
+            label = self.esims[changed_index]._list_label
+            if changed_index == len(labels):
+                labels.append(label)
+                self.esim_listbox.insert(tk.END, label)
+            elif labels[changed_index] != label:
+                selected = self.esim_listbox.selection_includes(changed_index)
+                labels[changed_index] = label
+                self.esim_listbox.delete(changed_index)
+                self.esim_listbox.insert(changed_index, label)
+                if selected:
+                    self.esim_listbox.selection_set(changed_index)
+            return
+        
+        # Reconstruction complète de la liste, sauf si aucun libellé n'a changé
+        new_labels = [esim._list_label for esim in self.esims]
+        if new_labels == labels:
+            return
+        labels[:] = new_labels
         self.esim_listbox.delete(0, tk.END)
-        for esim in self.esims:
-            self.esim_listbox.insert(tk.END, f"{esim.operator} ({esim.profile_state})")
+        self.esim_listbox.insert(tk.END, *labels)
     
     def on_esim_select(self, event):
         """Gère la sélection d'une eSIM dans la liste"""
@@ -236,73 +395,87 @@ class eSIMManagerApp:
         if not self.selected_esim:
             return
         
-        self.details_text.config(state=tk.NORMAL)
-        self.details_text.delete(1.0, tk.END)
-        
-        details = [
-            f"INFORMATIONS GÉNÉRALES:",
-            f"----------------------",
-            f"Opérateur: {self.selected_esim.operator}",
-            f"État du profil: {self.selected_esim.profile_state}",
-            f"",
-            f"IDENTIFIANTS:",
-            f"------------",
-            f"IMSI: {self.selected_esim.imsi}",
-            f"ICCID: {self.selected_esim.iccid}",
-            f"MSISDN (téléphone): {self.selected_esim.msisdn}",
-            f"",
-            f"AUTHENTIFICATION:",
-            f"----------------",
-            f"Clé Ki: {self.selected_esim.ki[:8]}...{self.selected_esim.ki[-8:]}",
-            f"Code OPc: {self.selected_esim.opc[:8]}...{self.selected_esim.opc[-8:]}",
-            f"",
-            f"CONSOMMATION:",
-            f"-------------",
-            f"Données utilisées: {self.selected_esim.data_usage} Mo",
-            f"Limite de données: {self.selected_esim.data_limit} Mo",
-            f"Pourcentage utilisé: {(self.selected_esim.data_usage / self.selected_esim.data_limit) * 100:.2f}%"
-        ]
-        
-        self.details_text.insert(tk.END, "\n".join(details))
-        self.details_text.config(state=tk.DISABLED)
+        e = self.selected_esim
+        details = {
+            "operator": e.operator,
+            "state": e.profile_state,
+            "imsi": e.imsi,
+            "iccid": e.iccid,
+            "msisdn": e.msisdn,
+            "ki": f"{e.ki[:8]}...{e.ki[-8:]}",
+            "opc": f"{e.opc[:8]}...{e.opc[-8:]}",
+            "data_usage": f"{e.data_usage} Mo",
+            "data_limit": f"{e.data_limit} Mo",
+            "pct": f"{e.data_usage * e._pct_factor:.2f}%",
+        }
+        
+        # Seuls les libellés dont la valeur a changé sont mis à jour
+        detail_values = self._detail_values
+        for key, value in details.items():
+            if detail_values.get(key) != value:
+                detail_values[key] = value
+                self._detail_vars[key].set(value)
     
     def update_history(self):
         """Met à jour l'affichage de l'historique des événements"""
         if not self.selected_esim:
             return
         
+        e = self.selected_esim
+        same_esim = e is self._history_esim
+        if same_esim:
+            # Seuls les événements pas encore affichés sont ajoutés
+            pending = e._event_count - self._history_count
+            if pending <= 0:
+                return
+            new_events = itertools.islice(e.events, max(len(e.events) - pending, 0), None)
+        else:
+            new_events = e.events
+        
         self.history_text.config(state=tk.NORMAL)
-        self.history_text.delete(1.0, tk.END)
+        if not same_esim:
+            self.history_text.delete(1.0, tk.END)
+        
+        self.history_text.insert(tk.END, "\n".join(new_events) + "\n")
         
-        for event in self.selected_esim.events:
-            self.history_text.insert(tk.END, f"{event}\n")
+        # Le widget ne conserve pas plus de lignes que l'historique de l'eSIM
+        excess = int(self.history_text.index("end-1c").split(".")[0]) - 1 - e.max_events
+        if excess > 0:
+            self.history_text.delete(1.0, f"{excess + 1}.0")
         
+        self._history_esim = e
+        self._history_count = e._event_count
         self.history_text.config(state=tk.DISABLED)
         self.history_text.see(tk.END)  # Défilement automatique vers le bas
     
     def activate_esim(self):
         """Active l'eSIM sélectionnée"""
-        if not self.selected_esim:
+        from tkinter import messagebox  # Import différé: dialogues chargés au premier usage
+        esim = self.selected_esim
+        if not esim:
             messagebox.showinfo("Information", "Veuillez sélectionner une eSIM")
             return
         
-        if self.selected_esim.activate():
-            messagebox.showinfo("Activation", f"L'eSIM {self.selected_esim.operator} a été activée")
-            self.update_esim_list()
+        if esim.activate():
+            messagebox.showinfo("Activation", f"L'eSIM {esim.operator} a été activée")
+            self.update_esim_list(self.esims.index(esim))
             self.update_esim_details()
             self.update_history()
+            self._ensure_sim_running()
         else:
             messagebox.showinfo("Information", "Cette eSIM est déjà active")
     
     def deactivate_esim(self):
         """Désactive l'eSIM sélectionnée"""
-        if not self.selected_esim:
+        from tkinter import messagebox
+        esim = self.selected_esim
+        if not esim:
             messagebox.showinfo("Information", "Veuillez sélectionner une eSIM")
             return
         
-        if self.selected_esim.deactivate():
-            messagebox.showinfo("Désactivation", f"L'eSIM {self.selected_esim.operator} a été désactivée")
-            self.update_esim_list()
+        if esim.deactivate():
+            messagebox.showinfo("Désactivation", f"L'eSIM {esim.operator} a été désactivée")
+            self.update_esim_list(self.esims.index(esim))
             self.update_esim_details()
             self.update_history()
         else:
@@ -310,7 +483,9 @@ class eSIMManagerApp:
     
     def disable_esim(self):
         """Désactive définitivement l'eSIM sélectionnée"""
-        if not self.selected_esim:
+        from tkinter import messagebox
+        esim = self.selected_esim
+        if not esim:
             messagebox.showinfo("Information", "Veuillez sélectionner une eSIM")
             return
         
@@ -318,9 +493,9 @@ class eSIMManagerApp:
         if not confirm:
             return
         
-        if self.selected_esim.disable():
-            messagebox.showinfo("Suppression", f"L'eSIM {self.selected_esim.operator} a été supprimée")
-            self.update_esim_list()
+        if esim.disable():
+            messagebox.showinfo("Suppression", f"L'eSIM {esim.operator} a été supprimée")
+            self.update_esim_list(self.esims.index(esim))
             self.update_esim_details()
             self.update_history()
         else:
@@ -328,12 +503,13 @@ class eSIMManagerApp:
     
     def create_new_esim(self):
         """Crée une nouvelle eSIM"""
+        from tkinter import simpledialog
         operator = simpledialog.askstring("Nouvel opérateur", "Nom de l'opérateur :")
         if operator:
             new_esim = eSIM(operator=operator)
             self.esims.append(new_esim)
             self.selected_esim = new_esim
-            self.update_esim_list()
+            self.update_esim_list(len(self.esims) - 1)
             self.update_esim_details()
             self.update_history()
             # Sélectionner la nouvelle eSIM dans la liste
@@ -342,102 +518,92 @@ class eSIMManagerApp:
     
     def change_operator(self):
         """Change l'opérateur de l'eSIM sélectionnée"""
-        if not self.selected_esim:
+        from tkinter import messagebox, simpledialog
+        esim = self.selected_esim
+        if not esim:
             messagebox.showinfo("Information", "Veuillez sélectionner une eSIM")
             return
         
         new_operator = simpledialog.askstring("Changer d'opérateur", 
-                                             f"Nouvel opérateur pour {self.selected_esim.operator} :")
+                                             f"Nouvel opérateur pour {esim.operator} :")
         if new_operator:
-            self.selected_esim.change_operator(new_operator)
-            self.update_esim_list()
+            esim.change_operator(new_operator)
+            self.update_esim_list(self.esims.index(esim))
             self.update_esim_details()
             self.update_history()
     
     def reset_data(self):
         """Réinitialise le compteur de données de l'eSIM sélectionnée"""
-        if not self.selected_esim:
+        from tkinter import messagebox
+        esim = self.selected_esim
+        if not esim:
             messagebox.showinfo("Information", "Veuillez sélectionner une eSIM")
             return
         
-        self.selected_esim.reset_data_usage()
+        esim.reset_data_usage()
         self.update_esim_details()
         self.update_history()
         messagebox.showinfo("Données réinitialisées", "Le compteur de données a été remis à zéro")
     
     def simulate_data_usage(self):
         """Simule l'utilisation des données en arrière-plan pour les eSIMs actives"""
-        for esim in self.esims:
-            if esim.profile_state == "Active":
-                # Consommation aléatoire entre 1 et 20 Mo
-                data_amount = random.uniform(1, 20)
-                esim.add_data_usage(data_amount)
-        
-        # Mise à jour de l'interface si nécessaire
-        if self.selected_esim and self.selected_esim.profile_state == "Active":
-            self.update_esim_details()
-            self.update_history()
-        
-        # Planification de la prochaine simulation (toutes les 30 secondes)
-        self.root.after(30000, self.simulate_data_usage)
-
-        confirm = messagebox.askyesno("Confirmation", "Êtes-vous sûr de vouloir désactiver définitivement cette eSIM ?")
-        if confirm and self.selected_esim.disable():
-            messagebox.showinfo("Désactivation", "L'eSIM a été désactivée définitivement")
-            self.update_esim_list()
-            self.update_esim_details()
-            self.update_history()
+        self._sim_scheduled = False
+        uniform = random.uniform
+        active = _ACTIVE
+        actives = [esim for esim in self.esims if esim.profile_state is active]
+        
+        # Consommation aléatoire entre 1 et 20 Mo, tirée en un seul vecteur si nombreuses eSIMs
+        rng = _vector_rng() if len(actives) > _NUMPY_MIN_BATCH else None
+        if rng is not None:
+            amounts = rng.uniform(1, 20, len(actives)).tolist()
         else:
-            messagebox.showinfo("Information", "L'eSIM est déjà désactivée définitivement")
-
-    def create_new_esim(self):
-        """Crée une nouvelle eSIM"""
-        operator = simpledialog.askstring("Nouvelle eSIM", "Nom de l'opérateur :")
-        if operator:
-            new_esim = eSIM(operator=operator)
-            self.esims.append(new_esim)
-            self.selected_esim = new_esim
-            self.update_esim_list()
-            self.update_esim_details()
-            self.update_history()
-            messagebox.showinfo("Succès", "Nouvelle eSIM créée avec succès")
-
-    def change_operator(self):
-        """Change l'opérateur de l'eSIM sélectionnée"""
-        if not self.selected_esim:
-            messagebox.showinfo("Information", "Veuillez sélectionner une eSIM")
-            return
+            amounts = [uniform(1, 20) for _ in actives]
+        for esim, data_amount in zip(actives, amounts):
+            esim.add_data_usage(data_amount)
+        
+        # Mise à jour de l'interface si nécessaire (un seul rafraîchissement par tick)
+        selected = self.selected_esim
+        if selected and selected.profile_state is active:
+            self._details_dirty = True
+            self._history_dirty = True
+            self._schedule_flush()
+        
+        # Planification de la prochaine simulation, uniquement si une eSIM est active
+        # (activate_esim relance la simulation le cas échéant)
+        if actives:
+            self._ensure_sim_running()
+    
+    def _ensure_sim_running(self):
+        """Planifie la prochaine simulation si elle ne l'est pas déjà"""
+        if not self._sim_scheduled:
+            self._sim_scheduled = True
+            self.root.after(self.SIMULATION_INTERVAL_MS, self.simulate_data_usage)
+    
+    def _schedule_flush(self):
+        """Planifie un rafraîchissement unique de l'interface lorsque Tk est inactif"""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush_ui)
+    
+    def _flush_ui(self):
+        """Applique les rafraîchissements en attente des détails et de l'historique"""
+        self._flush_scheduled = False
         
-        new_operator = simpledialog.askstring("Changement d'opérateur", "Entrez le nouvel opérateur :")
-        if new_operator:
-            self.selected_esim.change_operator(new_operator)
-            self.update_esim_list()
-            self.update_esim_details()
-            self.update_history()
-            messagebox.showinfo("Succès", f"Opérateur changé pour {new_operator}")
-
-    def reset_data(self):
-        """Réinitialise la consommation de données de l'eSIM sélectionnée"""
-        if not self.selected_esim:
-            messagebox.showinfo("Information", "Veuillez sélectionner une eSIM")
+        # Fenêtre réduite ou masquée: les rafraîchissements restent en attente
+        if self.root.state() == "iconic" or not self.root.winfo_viewable():
             return
         
-        self.selected_esim.reset_data_usage()
-        self.update_esim_details()
-        self.update_history()
-        messagebox.showinfo("Succès", "Compteur de données réinitialisé")
-
-    def simulate_data_usage(self):
-        """Simule une consommation de données toutes les 10 secondes"""
-        if self.selected_esim and self.selected_esim.profile_state == "Active":
-            used_data = random.randint(1, 20)  # Mo consommés
-            self.selected_esim.add_data_usage(used_data)
+        if self._details_dirty:
+            self._details_dirty = False
             self.update_esim_details()
+        if self._history_dirty:
+            self._history_dirty = False
             self.update_history()
-        
-        # Replanifie la simulation dans 10 secondes
-        self.root.after(10000, self.simulate_data_usage)
-       
+    
+    def _on_map(self, event):
+        """Applique les rafraîchissements en attente quand la fenêtre est de nouveau affichée"""
+        if event.widget is self.root and (self._details_dirty or self._history_dirty):
+            self._schedule_flush()
 
 
 if __name__ == "__main__":